@@ -45,10 +45,20 @@ def main():
         # --- STEP 3 & 4: USER INTERACTION (FILTERS) ---
         print("\n[3/10] Preparing Filter Options...")
         
-        # Calculate available options for display
-        regions = sorted(list(set(t['Region'] for t in all_transactions if t['Region'])))
-        amounts = [t['Quantity'] * t['UnitPrice'] for t in all_transactions]
-        min_amt, max_amt = (min(amounts), max(amounts)) if amounts else (0, 0)
+        # Calculate available options for display (one pass, running min/max)
+        region_set = set()
+        min_amt = max_amt = None
+        for t in all_transactions:
+            if t['Region']:
+                region_set.add(t['Region'])
+            amount = t['_Revenue']
+            if min_amt is None or amount < min_amt:
+                min_amt = amount
+            if max_amt is None or amount > max_amt:
+                max_amt = amount
+        regions = sorted(region_set)
+        if min_amt is None:
+            min_amt, max_amt = 0, 0
         
         print(f"   Available Regions: {', '.join(regions)}")
         print(f"   Amount Range: ${min_amt:,.2f} - ${max_amt:,.2f}")
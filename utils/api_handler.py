@@ -1,27 +1,111 @@
-import requests
+import hashlib
 import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import orjson # Optional: faster JSON decoding when installed
+except ImportError:
+    orjson = None
+
+# DummyJSON products endpoint; pages of PAGE_SIZE are fetched concurrently
+API_URL = 'https://dummyjson.com/products'
+PRODUCT_LIMIT = 100
+PAGE_SIZE = 100
+MAX_FETCH_WORKERS = 8
+
+# Local cache for API responses (repeat runs skip the network)
+CACHE_DIR = '.cache'
+CACHE_TTL_SECONDS = 24 * 60 * 60
+
+# Rows joined into a single write() when saving enriched data
+WRITE_BATCH_ROWS = 2000
+
+def _fetch_page(session, skip):
+    """
+    Fetches one page of products starting at offset `skip`.
+    """
+    params = {'limit': min(PAGE_SIZE, PRODUCT_LIMIT - skip), 'skip': skip}
+    response = session.get(API_URL, params=params, timeout=10) # 10s timeout to prevent hanging
+    
+    # Check if request was successful (Status Code 200)
+    response.raise_for_status()
+    
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError (caught by caller)
+    data = orjson.loads(response.content) if orjson else response.json()
+    return data.get('products', [])
 
 def fetch_all_products():
     """
     Fetches all products from DummyJSON API.
-    Handles pagination/limits (fetches 100 products as per requirement).
+    Handles pagination/limits (fetches 100 products as per requirement,
+    requesting pages of PAGE_SIZE concurrently over one connection pool).
     
     Returns:
         list: List of product dictionaries from API.
     """
-    url = 'https://dummyjson.com/products?limit=100'
+    url = f'{API_URL}?limit={PRODUCT_LIMIT}'
+    
+    # Serve repeat runs from the local cache while it is fresh
+    cache_path = os.path.join(CACHE_DIR, hashlib.md5(url.encode(), usedforsecurity=False).hexdigest() + '.json')
+    try:
+        if time.time() - os.path.getmtime(cache_path) < CACHE_TTL_SECONDS:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                products = json.load(f)
+            if isinstance(products, list):
+                print(f"Loaded {len(products)} products from cache: {cache_path}")
+                return products
+    except (OSError, ValueError):
+        pass # Missing or unreadable cache (ValueError covers bad JSON/encoding)
+    
+    # Anything else (stale or malformed cache) falls back to the API
     print(f"Fetching data from API: {url}...")
     
     try:
-        response = requests.get(url, timeout=10) # 10s timeout to prevent hanging
+        offsets = range(0, PRODUCT_LIMIT, PAGE_SIZE)
+        if not offsets:
+            print("No products requested (PRODUCT_LIMIT <= 0).")
+            return []
+        workers = min(MAX_FETCH_WORKERS, len(offsets))
         
-        # Check if request was successful (Status Code 200)
-        response.raise_for_status()
+        # requests.Session is not documented as thread-safe, so each worker
+        # gets its own session; all of them mount the same pooled adapter
+        # so keep-alive connections are still reused across pages
+        adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+        thread_state = threading.local()
         
-        data = response.json()
-        products = data.get('products', [])
+        def fetch_page(skip):
+            session = getattr(thread_state, 'session', None)
+            if session is None:
+                session = thread_state.session = requests.Session()
+                session.mount('https://', adapter)
+            return _fetch_page(session, skip)
+        
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                pages = executor.map(fetch_page, offsets)
+                products = [prod for page in pages for prod in page]
+        finally:
+            adapter.close()
         
         print(f"Successfully fetched {len(products)} products from API.")
+        
+        # Write to a temp file first so a crash never leaves a partial cache
+        if products:
+            try:
+                os.makedirs(CACHE_DIR, exist_ok=True)
+                tmp_path = cache_path + '.tmp'
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(products, f)
+                os.replace(tmp_path, cache_path)
+            except OSError as e:
+                print(f"Warning: Could not write API cache. Reason: {e}")
+        
         return products
         
     except requests.exceptions.RequestException as e:
@@ -51,44 +135,43 @@ def create_product_mapping(api_products):
 def enrich_sales_data(transactions, product_mapping):
     """
     Enriches transaction data by merging with API product info.
+    The API fields are added to the transaction dicts in place.
     """
     enriched_data = []
+    # ProductID -> (category, brand, rating, match); IDs repeat heavily, so
+    # each distinct ID is parsed and looked up only once
+    lookup_cache = {}
     
     print("Enriching sales data with API details...")
     
     for txn in transactions:
-        # Create a copy to avoid modifying original list
-        new_txn = txn.copy()
-        
         # Extract ID: "P109" -> "109" -> 109
         prod_id_str = txn['ProductID']
         
-        api_match = False
-        # Default values
-        new_txn['API_Category'] = 'None'
-        new_txn['API_Brand'] = 'None'
-        new_txn['API_Rating'] = 0.0
-        
-        try:
-            # Remove 'P' or other non-digit chars
-            clean_id_str = ''.join(filter(str.isdigit, prod_id_str))
+        api_info = lookup_cache.get(prod_id_str)
+        if api_info is None:
+            # Default values
+            api_info = ('None', 'None', 0.0, False)
             
-            if clean_id_str:
-                prod_id = int(clean_id_str)
+            try:
+                # Remove 'P' or other non-digit chars
+                clean_id_str = ''.join(filter(str.isdigit, prod_id_str))
                 
-                # Check mapping
-                if prod_id in product_mapping:
-                    info = product_mapping[prod_id]
-                    new_txn['API_Category'] = info['category']
-                    new_txn['API_Brand'] = info['brand']
-                    new_txn['API_Rating'] = info['rating']
-                    api_match = True
+                if clean_id_str:
+                    prod_id = int(clean_id_str)
                     
-        except ValueError:
-            pass 
+                    # Check mapping
+                    if prod_id in product_mapping:
+                        info = product_mapping[prod_id]
+                        api_info = (info['category'], info['brand'], info['rating'], True)
+                        
+            except ValueError:
+                pass 
             
-        new_txn['API_Match'] = api_match
-        enriched_data.append(new_txn)
+            lookup_cache[prod_id_str] = api_info
+        
+        txn['API_Category'], txn['API_Brand'], txn['API_Rating'], txn['API_Match'] = api_info
+        enriched_data.append(txn)
         
     return enriched_data
 
@@ -114,7 +197,8 @@ def save_enriched_data(enriched_transactions, filename='data/enriched_sales_data
             # Write Header
             f.write('|'.join(header) + '\n')
             
-            # Write Rows
+            # Write Rows in batches to keep the number of write() calls low
+            rows = []
             for txn in enriched_transactions:
                 row = [
                     str(txn.get('TransactionID', '')),
@@ -131,7 +215,13 @@ def save_enriched_data(enriched_transactions, filename='data/enriched_sales_data
                     str(txn.get('API_Rating', 0.0)),
                     str(txn.get('API_Match', False))
                 ]
-                f.write('|'.join(row) + '\n')
+                rows.append('|'.join(row))
+                if len(rows) >= WRITE_BATCH_ROWS:
+                    f.write('\n'.join(rows) + '\n')
+                    rows.clear()
+            
+            if rows:
+                f.write('\n'.join(rows) + '\n')
                 
         print("File saved successfully.")
         
@@ -1,3 +1,6 @@
+import heapq
+import sys
+from collections import defaultdict
 from datetime import datetime
 
 # --- PART 1: PARSING & FILTERING (Previous Task) ---
@@ -17,9 +20,13 @@ def parse_transactions(raw_lines):
                 'ProductName': parts[3].strip().replace(',', ''),
                 'Quantity': int(parts[4].strip().replace(',', '')),
                 'UnitPrice': float(parts[5].strip().replace(',', '')),
-                'CustomerID': parts[6].strip(),
-                'Region': parts[7].strip()
+                # Low-cardinality grouping keys are interned so repeated
+                # dict lookups on them hit the identity fast path
+                'CustomerID': sys.intern(parts[6].strip()),
+                'Region': sys.intern(parts[7].strip())
             }
+            # Line amount computed once here instead of in every analytic
+            record['_Revenue'] = record['Quantity'] * record['UnitPrice']
             parsed_data.append(record)
         except (ValueError, IndexError):
             continue
@@ -35,31 +42,32 @@ def validate_and_filter_data(transactions, region=None, min_amount=None, max_amo
     filtered_region = 0
     filtered_amount = 0
 
+    # Hoist loop-invariant work out of the per-row checks
+    region_key = region.lower() if region else None
+    check_amount = min_amount is not None or max_amount is not None
+
     for txn in transactions:
-        # Validation
-        if txn['Quantity'] <= 0 or txn['UnitPrice'] <= 0:
-            invalid_count += 1
-            continue
-        if not txn['Region'] or not txn['CustomerID']:
-            invalid_count += 1
-            continue
-        if not txn['TransactionID'].startswith('T'):
+        # Validation (all rules folded into one short-circuiting test)
+        if (txn['Quantity'] <= 0 or txn['UnitPrice'] <= 0
+                or not txn['Region'] or not txn['CustomerID']
+                or not txn['TransactionID'].startswith('T')):
             invalid_count += 1
             continue
             
         # Filter Region
-        if region and txn['Region'].lower() != region.lower():
+        if region_key and txn['Region'].lower() != region_key:
             filtered_region += 1
             continue
             
         # Filter Amount
-        total = txn['Quantity'] * txn['UnitPrice']
-        if min_amount is not None and total < min_amount:
-            filtered_amount += 1
-            continue
-        if max_amount is not None and total > max_amount:
-            filtered_amount += 1
-            continue
+        if check_amount:
+            total = txn['_Revenue']
+            if min_amount is not None and total < min_amount:
+                filtered_amount += 1
+                continue
+            if max_amount is not None and total > max_amount:
+                filtered_amount += 1
+                continue
             
         valid_txns.append(txn)
         
@@ -76,7 +84,7 @@ def validate_and_filter_data(transactions, region=None, min_amount=None, max_amo
 
 def calculate_total_revenue(transactions):
     """Calculates total revenue from all transactions."""
-    total_revenue = sum(t['Quantity'] * t['UnitPrice'] for t in transactions)
+    total_revenue = sum(t['_Revenue'] for t in transactions)
     return total_revenue
 
 def region_wise_sales(transactions):
@@ -84,27 +92,25 @@ def region_wise_sales(transactions):
     Analyzes sales by region.
     Returns: Dict with sales, count, and percentage per region.
     """
-    region_stats = {}
-    total_revenue = calculate_total_revenue(transactions)
+    region_stats = defaultdict(lambda: [0.0, 0]) # [total_sales, transaction_count]
+    total_revenue = 0.0
     
-    # 1. Aggregate Data
+    # 1. Aggregate Data (grand total accumulated in the same pass)
     for t in transactions:
-        r = t['Region']
-        amount = t['Quantity'] * t['UnitPrice']
-        
-        if r not in region_stats:
-            region_stats[r] = {'total_sales': 0.0, 'transaction_count': 0}
+        amount = t['_Revenue']
+        total_revenue += amount
         
-        region_stats[r]['total_sales'] += amount
-        region_stats[r]['transaction_count'] += 1
+        stats = region_stats[t['Region']]
+        stats[0] += amount
+        stats[1] += 1
         
     # 2. Calculate Percentage & Format
     final_stats = {}
-    for r, stats in region_stats.items():
-        percent = (stats['total_sales'] / total_revenue) * 100 if total_revenue > 0 else 0
+    for r, (sales, count) in region_stats.items():
+        percent = (sales / total_revenue) * 100 if total_revenue > 0 else 0
         final_stats[r] = {
-            'total_sales': round(stats['total_sales'], 2),
-            'transaction_count': stats['transaction_count'],
+            'total_sales': round(sales, 2),
+            'transaction_count': count,
             'percentage': round(percent, 2)
         }
         
@@ -115,66 +121,54 @@ def region_wise_sales(transactions):
     
     return sorted_stats
 
-def top_selling_products(transactions, n=5):
+def _product_totals(transactions):
     """
-    Finds top n products by total quantity sold.
+    Aggregates quantity and revenue per product.
     Returns: List of tuples (ProductName, TotalQuantity, TotalRevenue).
     """
-    product_map = {}
+    product_map = defaultdict(lambda: [0, 0.0]) # [qty, rev]
     
     for t in transactions:
-        p_name = t['ProductName']
-        qty = t['Quantity']
-        rev = qty * t['UnitPrice']
-        
-        if p_name not in product_map:
-            product_map[p_name] = {'qty': 0, 'rev': 0.0}
-        
-        product_map[p_name]['qty'] += qty
-        product_map[p_name]['rev'] += rev
+        stats = product_map[t['ProductName']]
+        stats[0] += t['Quantity']
+        stats[1] += t['_Revenue']
         
     # Convert to list
-    product_list = [
-        (name, data['qty'], round(data['rev'], 2)) 
-        for name, data in product_map.items()
+    return [
+        (name, qty, round(rev, 2)) 
+        for name, (qty, rev) in product_map.items()
     ]
-    
-    # Sort by Quantity Descending
-    product_list.sort(key=lambda x: x[1], reverse=True)
-    
-    return product_list[:n]
+
+def top_selling_products(transactions, n=5):
+    """
+    Finds top n products by total quantity sold.
+    Returns: List of tuples (ProductName, TotalQuantity, TotalRevenue).
+    """
+    # Select top n by Quantity Descending without sorting every product
+    return heapq.nlargest(n, _product_totals(transactions), key=lambda x: x[1])
 
 def customer_analysis(transactions):
     """
     Analyzes customer purchase patterns.
     Returns: Dict of customer statistics.
     """
-    cust_stats = {}
+    # [total_spent, purchase_count, products_bought] (set for unique products)
+    cust_stats = defaultdict(lambda: [0.0, 0, set()])
     
     for t in transactions:
-        c_id = t['CustomerID']
-        amount = t['Quantity'] * t['UnitPrice']
-        prod = t['ProductName']
-        
-        if c_id not in cust_stats:
-            cust_stats[c_id] = {
-                'total_spent': 0.0,
-                'purchase_count': 0,
-                'products_bought': set() # Using set for unique products
-            }
-            
-        cust_stats[c_id]['total_spent'] += amount
-        cust_stats[c_id]['purchase_count'] += 1
-        cust_stats[c_id]['products_bought'].add(prod)
+        stats = cust_stats[t['CustomerID']]
+        stats[0] += t['_Revenue']
+        stats[1] += 1
+        stats[2].add(t['ProductName'])
         
     # Format Output
     final_stats = {}
-    for c_id, data in cust_stats.items():
+    for c_id, (spent, count, products) in cust_stats.items():
         final_stats[c_id] = {
-            'total_spent': round(data['total_spent'], 2),
-            'purchase_count': data['purchase_count'],
-            'avg_order_value': round(data['total_spent'] / data['purchase_count'], 2),
-            'products_bought': list(data['products_bought'])
+            'total_spent': round(spent, 2),
+            'purchase_count': count,
+            'avg_order_value': round(spent / count, 2),
+            'products_bought': list(products)
         }
         
     # Sort by total_spent descending
@@ -185,32 +179,24 @@ def daily_sales_trend(transactions):
     Analyzes sales trends by date.
     Returns: Dictionary sorted by date with revenue, count, and unique customers.
     """
-    daily_stats = {}
+    daily_stats = defaultdict(lambda: [0.0, 0, set()]) # [revenue, txns, customers]
     
     for t in transactions:
-        date = t['Date']
-        amount = t['Quantity'] * t['UnitPrice']
-        cust = t['CustomerID']
-        
-        if date not in daily_stats:
-            daily_stats[date] = {'revenue': 0.0, 'txns': 0, 'customers': set()}
-            
-        daily_stats[date]['revenue'] += amount
-        daily_stats[date]['txns'] += 1
-        daily_stats[date]['customers'].add(cust)
+        stats = daily_stats[t['Date']]
+        stats[0] += t['_Revenue']
+        stats[1] += 1
+        stats[2].add(t['CustomerID'])
         
     # Format and Sort by Date
     formatted_stats = {}
     
-    # Sort keys (dates)
-    sorted_dates = sorted(daily_stats.keys())
-    
-    for date in sorted_dates:
-        data = daily_stats[date]
+    # Sort by date; keys are unique ISO 'YYYY-MM-DD' strings, which already sort
+    # chronologically, so no per-date parsing is needed
+    for date, (revenue, txns, customers) in sorted(daily_stats.items()):
         formatted_stats[date] = {
-            'daily_revenue': round(data['revenue'], 2),
-            'transaction_count': data['txns'],
-            'unique_customers': len(data['customers'])
+            'daily_revenue': round(revenue, 2),
+            'transaction_count': txns,
+            'unique_customers': len(customers)
         }
         
     return formatted_stats
@@ -220,30 +206,33 @@ def find_peak_sales_day(transactions):
     Identifies the date with highest revenue.
     Returns: Tuple (date, revenue, transaction_count).
     """
-    trends = daily_sales_trend(transactions)
+    # Aggregate revenue and count per day only (no customer sets, no sort)
+    daily_totals = defaultdict(lambda: [0.0, 0]) # [revenue, count]
+    for t in transactions:
+        stats = daily_totals[t['Date']]
+        stats[0] += t['_Revenue']
+        stats[1] += 1
     
-    if not trends:
+    if not daily_totals:
         return None
         
-    # Find max revenue day
-    peak_day = max(trends.items(), key=lambda x: x[1]['daily_revenue'])
+    # Find max revenue day (ties go to the earliest date)
+    peak_day = None
+    for date, (revenue, count) in daily_totals.items():
+        revenue = round(revenue, 2)
+        if (peak_day is None or revenue > peak_day[1]
+                or (revenue == peak_day[1] and date < peak_day[0])):
+            peak_day = (date, revenue, count)
     
-    # peak_day is ('2024-12-15', {'daily_revenue': ...})
-    date = peak_day[0]
-    metrics = peak_day[1]
-    
-    return (date, metrics['daily_revenue'], metrics['transaction_count'])
+    return peak_day
 
 def low_performing_products(transactions, threshold=10):
     """
     Identifies products with total quantity sold < threshold.
     Returns: List of tuples sorted by quantity ascending.
     """
-    # Reuse logic from top_selling but don't slice top N
-    all_products = top_selling_products(transactions, n=1000)
-    
-    # Filter for low quantity
-    low_performers = [p for p in all_products if p[1] < threshold]
+    # Filter for low quantity straight from the per-product totals
+    low_performers = [p for p in _product_totals(transactions) if p[1] < threshold]
     
     # Sort ascending (lowest first)
     low_performers.sort(key=lambda x: x[1])
@@ -257,13 +246,11 @@ def enrich_sales_data(transactions, product_mapping):
     """
     Enriches transaction data with API product information.
     Matches 'P101' -> ID 101.
+    The API fields are added to the transaction dicts in place.
     """
     enriched_data = []
     
     for txn in transactions:
-        # Create a copy to avoid modifying original list directly
-        new_txn = txn.copy()
-        
         # Extract numeric ID from 'P101', 'P109', etc.
         try:
             p_id_str = txn['ProductID']
@@ -277,18 +264,18 @@ def enrich_sales_data(transactions, product_mapping):
             api_info = product_mapping[numeric_id]
             
             # Add new fields
-            new_txn['API_Match'] = True
-            new_txn['API_Category'] = api_info['category']
-            new_txn['API_Brand'] = api_info['brand']
-            new_txn['API_Rating'] = api_info['rating']
+            txn['API_Match'] = True
+            txn['API_Category'] = api_info['category']
+            txn['API_Brand'] = api_info['brand']
+            txn['API_Rating'] = api_info['rating']
         else:
             # Product not found in API
-            new_txn['API_Match'] = False
-            new_txn['API_Category'] = 'N/A'
-            new_txn['API_Brand'] = 'N/A'
-            new_txn['API_Rating'] = 0.0
+            txn['API_Match'] = False
+            txn['API_Category'] = 'N/A'
+            txn['API_Brand'] = 'N/A'
+            txn['API_Rating'] = 0.0
             
-        enriched_data.append(new_txn)
+        enriched_data.append(txn)
         
     return enriched_data
 
@@ -1,5 +1,36 @@
+import codecs
+import mmap
 import os
 
+# Bytes decoded per step when scanning the mapped input file
+READ_CHUNK_SIZE = 1024 * 1024
+
+def _iter_lines(mm, encoding):
+    """
+    Yields decoded lines from a memory-mapped file.
+    Decodes fixed-size chunks and carries the partial last line over to the
+    next chunk. Line breaks follow universal newlines: '\r\n', '\r' and '\n'.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)()
+    tail = ''
+    for start in range(0, len(mm), READ_CHUNK_SIZE):
+        text = tail + decoder.decode(mm[start:start + READ_CHUNK_SIZE])
+        
+        # Hold back a trailing '\r' so a '\r\n' split across chunks
+        # still counts as a single line break
+        carry_cr = text.endswith('\r')
+        if carry_cr:
+            text = text[:-1]
+        
+        lines = text.replace('\r\n', '\n').replace('\r', '\n').split('\n')
+        tail = lines.pop()
+        if carry_cr:
+            tail += '\r'
+        yield from lines
+    
+    text = tail + decoder.decode(b'', final=True)
+    yield from text.replace('\r\n', '\n').replace('\r', '\n').split('\n')
+
 def read_sales_data(filename):
     """
     Reads the sales data file handling potential encoding issues.
@@ -18,29 +49,36 @@ def read_sales_data(filename):
         print(f"Error: The file '{filename}' was not found.")
         return []
 
-    for encoding in encodings_to_try:
-        try:
-            print(f"Attempting to read file with encoding: {encoding}")
-            with open(filename, 'r', encoding=encoding) as file:
-                lines = file.readlines()
-                
-                # Check if file is empty
-                if not lines:
-                    return []
-                
-                # Skip header and remove empty lines immediately
-                # lines[1:] skips the first row (Header)
-                cleaned_lines = [line.strip() for line in lines[1:] if line.strip()]
-                
-                print(f"Successfully read {len(cleaned_lines)} lines using {encoding}.")
-                return cleaned_lines
-                
-        except UnicodeDecodeError:
-            # If this encoding fails, the loop continues to the next one
-            continue
-        except Exception as e:
-            print(f"Unexpected error with encoding {encoding}: {e}")
-            return []
+    try:
+        with open(filename, 'rb') as raw_file:
+            file_size = os.fstat(raw_file.fileno()).st_size
+            
+            # Check if file is empty (mmap cannot map a zero-length file)
+            if file_size == 0:
+                return []
+            
+            # Map the file read-only so lines are sliced straight from the
+            # page cache instead of copying the whole file via readlines()
+            with mmap.mmap(raw_file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for encoding in encodings_to_try:
+                    try:
+                        print(f"Attempting to read file with encoding: {encoding}")
+                        lines = _iter_lines(mm, encoding)
+                        
+                        # Skip header and remove empty lines immediately
+                        next(lines, None)
+                        cleaned_lines = [line.strip() for line in lines if line.strip()]
+                        
+                        print(f"Successfully read {len(cleaned_lines)} lines using {encoding}.")
+                        return cleaned_lines
+                        
+                    except UnicodeDecodeError:
+                        # If this encoding fails, the loop continues to the next one
+                        continue
+                        
+    except Exception as e:
+        print(f"Unexpected error while reading {filename}: {e}")
+        return []
 
     print("Error: Failed to read file with all attempted encodings.")
     return []
\ No newline at end of file
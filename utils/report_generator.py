@@ -1,4 +1,5 @@
 import os
+from collections import defaultdict
 from datetime import datetime
 
 def generate_sales_report(transactions, enriched_transactions, output_file='output/sales_report.txt'):
@@ -17,22 +18,39 @@ def generate_sales_report(transactions, enriched_transactions, output_file='outp
     
     # --- 1. PREPARE CALCULATIONS ---
     
+    # Single pass over transactions: revenue, date range, region/product/daily totals
+    total_revenue = 0.0
+    date_min = date_max = None
+    region_agg = defaultdict(lambda: [0.0, 0]) # region -> [sales, count]
+    product_sales = defaultdict(float)
+    daily_sales = defaultdict(float)
+    for t in transactions:
+        amt = t['_Revenue']
+        total_revenue += amt
+
+        d = t['Date']
+        if date_min is None or d < date_min:
+            date_min = d
+        if date_max is None or d > date_max:
+            date_max = d
+
+        r_stats = region_agg[t['Region']]
+        r_stats[0] += amt
+        r_stats[1] += 1
+
+        product_sales[t['ProductName']] += amt
+        daily_sales[d] += amt
+
     # Basic Stats
-    total_revenue = sum(t['Quantity'] * t['UnitPrice'] for t in transactions)
     total_txns = len(transactions)
     avg_order_value = total_revenue / total_txns if total_txns > 0 else 0
     
     # Date Range
-    dates = [t['Date'] for t in transactions]
-    date_range = f"{min(dates)} to {max(dates)}" if dates else "N/A"
+    date_range = f"{date_min} to {date_max}" if date_min is not None else "N/A"
     
     # Region Stats
-    regions = set(t['Region'] for t in transactions)
     region_data = []
-    for r in regions:
-        r_txns = [t for t in transactions if t['Region'] == r]
-        r_sales = sum(t['Quantity'] * t['UnitPrice'] for t in r_txns)
-        r_count = len(r_txns)
+    for r, (r_sales, r_count) in region_agg.items():
         r_pct = (r_sales / total_revenue * 100) if total_revenue > 0 else 0
         r_avg = r_sales / r_count if r_count > 0 else 0
         region_data.append((r, r_sales, r_pct, r_count, r_avg))
@@ -41,24 +59,20 @@ def generate_sales_report(transactions, enriched_transactions, output_file='outp
     region_data.sort(key=lambda x: x[1], reverse=True)
     
     # Top 5 Products
-    product_sales = {}
-    for t in transactions:
-        p = t['ProductName']
-        s = t['Quantity'] * t['UnitPrice']
-        product_sales[p] = product_sales.get(p, 0) + s
     top_products = sorted(product_sales.items(), key=lambda x: x[1], reverse=True)[:5]
     
     # Enrichment Stats
     total_enriched_input = len(enriched_transactions)
-    successful_enrichment = sum(1 for t in enriched_transactions if t.get('API_Match', False))
-    failed_products = set(t['ProductID'] for t in enriched_transactions if not t.get('API_Match', False))
+    successful_enrichment = 0
+    failed_products = set()
+    for t in enriched_transactions:
+        if t.get('API_Match', False):
+            successful_enrichment += 1
+        else:
+            failed_products.add(t['ProductID'])
     success_rate = (successful_enrichment / total_enriched_input * 100) if total_enriched_input > 0 else 0
 
     # Best Selling Day
-    daily_sales = {}
-    for t in transactions:
-        d = t['Date']
-        daily_sales[d] = daily_sales.get(d, 0) + (t['Quantity'] * t['UnitPrice'])
     best_day = max(daily_sales.items(), key=lambda x: x[1]) if daily_sales else ("N/A", 0)
 
     # --- 2. WRITE TO FILE ---